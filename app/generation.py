@@ -1,33 +1,66 @@
-import json
 import os
 
 import gradio as gr
-from openai import OpenAI
 
 import example
 import asyncio
-from utils.read import read_json
+from utils.read import read_environment_context
+from utils import jsonio
 from tools.personality import read_personality
 from tools.names import generate_names
-from dotenv import load_dotenv
-
-
-
-
-async def character_generation(prompt, name):
-  load_dotenv()
-  client = OpenAI(
-  # This is the default and can be omitted
-  api_key=os.getenv("OPENAI_API_KEY"), )
-
+from app.openai_client import async_client
+
+# Enough for one character in the fixed profile schema; output tokens
+# dominate completion latency, so keep the model from running on
+CHARACTER_MAX_TOKENS = 600
+
+CHARACTER_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "npc",
+        "schema": example.character_schema,
+        "strict": True
+    }
+}
+
+EXAMPLES_PROMPT = "\n\n".join(jsonio.dumps(e) for e in example.examples)
+
+
+async def collect_stream(stream):
+  """Join the content deltas of a streamed chat completion into one string."""
+  parts = []
+  refusal = []
+  finish_reason = None
+  async for chunk in stream:
+    if chunk.choices:
+      choice = chunk.choices[0]
+      if choice.delta.content:
+        parts.append(choice.delta.content)
+      # Under a strict json_schema format a refusal arrives here, not in content
+      if choice.delta.refusal:
+        refusal.append(choice.delta.refusal)
+      if choice.finish_reason is not None:
+        finish_reason = choice.finish_reason
+    if chunk.usage is not None:
+      print(chunk.usage)
+
+  # Anything but a clean stop (max_tokens, content filter) is incomplete JSON
+  if refusal:
+    raise ValueError("Model refused the request: " + "".join(refusal))
+  if finish_reason != "stop":
+    raise ValueError(f"Completion ended with finish_reason={finish_reason!r}")
+  return "".join(parts)
+
+
+async def character_generation(prompt, name, personality):
   # Add a prompt for the model to generate a new example
-  prompt += "Create a new character profile that fits in this environment with the following personality " + str(
-      read_personality) + " and this name " + name
+  prompt += "Create a new character profile that fits in this environment with the following personality " + ", ".join(
+      personality) + " and this name " + name
 
   print(prompt)
 
-  chat_completion = client.chat.completions.create(
-      response_format={"type": "json_object"},
+  stream = await async_client.chat.completions.create(
+      response_format=CHARACTER_RESPONSE_FORMAT,
       messages=[{
           "role":
           "system",
@@ -38,44 +71,36 @@ async def character_generation(prompt, name):
           "content": prompt
       }],
       model="gpt-4o-mini-2024-07-18",
+      max_tokens=CHARACTER_MAX_TOKENS,
+      temperature=0.9,
+      stream=True,
+      stream_options={"include_usage": True},
   )
-  chat = ""
-  character = dict()
-  if chat_completion.choices[0].message.content is not None:
-    temp = json.loads(chat_completion.choices[0].message.content)
-    character["name"] = temp["name"]
-    character["age"] = temp["age"]
-    character["gender"] = temp["gender"]
-    character["personalities"] = temp["personalities"]
-    character["appearance"] = temp["appearance"]
-    character["background"] = temp["background"]
-    chat = str(character)
+
+  # Collect the deltas as they arrive instead of waiting on the full body
+  try:
+    content = await collect_stream(stream)
+  except ValueError as e:
+    raise ValueError(f"Could not generate a profile for {name}: {e}") from e
 
   # generated_image = client.images.generate(
   #   model="dall-e-2",
-  #   prompt=chat,
+  #   prompt=content,
   #   n=1,
   #   size="1024x1024"
   # )
 
-  print(type(chat_completion.choices[0].message.content))
-  print(chat_completion)
-  final = chat_completion.choices[0].message.content
+  print(content)
   # return [chat_completion.choices[0].message.content, generated_image.data[0].url]
-  return "" if final is None else final
+  return content
 
 async def relationship_generation(prompt,examples,characters):
-  load_dotenv()
-  client = OpenAI(
-  # This is the default and can be omitted
-  api_key=os.getenv("OPENAI_API_KEY"), )
-
   # Add a prompt for the model to generate a new example
   prompt += " Given a list of characters, generate a edge list of relationships between them with a backstory and a description of the relationship. Add a weight to each relationship between -1 and 1. Have a good mix between positive and negative relationships. This is the list of characters: " + str(characters) + "\n\n Generate following the examples from below: " + str(examples)
 
   print(prompt)
 
-  chat_completion = client.chat.completions.create(
+  stream = await async_client.chat.completions.create(
       response_format={"type": "json_object"},
       messages=[{
           "role":
@@ -87,23 +112,23 @@ async def relationship_generation(prompt,examples,characters):
           "content": prompt
       }],
       model="gpt-4o-mini-2024-07-18",
+      stream=True,
+      stream_options={"include_usage": True},
   )
 
-
-  print(type(chat_completion.choices[0].message.content))
-  print(chat_completion)
-  final = chat_completion.choices[0].message.content
+  # The edge list is the largest response in the pipeline, so stream it too
+  final = await collect_stream(stream)
 
   relationships = []
 
   print(final)
-  formatted_results = json.dumps(final, indent=2)
+  formatted_results = jsonio.dumps(final, indent=True)
   # Write the formatted results to output.json in the main project folder
   output_file = os.path.join(os.getcwd(), 'output-edgelist.json')
-  with open(output_file, 'w') as outfile:
+  with open(output_file, 'w', encoding='utf-8') as outfile:
       outfile.write(formatted_results)
 
-  final = json.loads(final)
+  final = jsonio.loads(final)
 
   for i in range(len(final["edge_list"]["relationships"])):
     temp = {}
@@ -120,52 +145,46 @@ async def relationship_generation(prompt,examples,characters):
 
 async def instruction(file_obj, amount):
   amount = int(amount)
-  data = read_json(file_obj)
-  environment_context = (f"Era: {data['era']}, "
-                         f"Time Period: {data['time_period']}, "
-                         f"Detail: {data['detail']}\n\n")
-  examples = example.examples
-
-  prompt = environment_context + "\n\n".join([e["example"]
-                                              for e in examples]) + "\n\n"
+  environment_context = read_environment_context(file_obj)
+  prompt = environment_context + EXAMPLES_PROMPT + "\n\n"
 
   tasks = set()
 
-  names = generate_names(file_obj, amount)
+  names = await generate_names(file_obj, amount)
   for x in range(amount):
 
-    task = asyncio.create_task(character_generation(prompt, names[x]))
+    task = asyncio.create_task(
+        character_generation(prompt, names[x], read_personality()))
     tasks.add(task)
 
 
-  await asyncio.gather(*tasks)
-
-  results = [json.loads(task.result()) for task in tasks]
-  
-  # Format the results as a list of JSON objects
-  formatted_results = json.dumps(results, indent=2)
-
-  # Write the formatted results to output.json in the main project folder
-  output_file = os.path.join(os.getcwd(), 'output.json')
-  with open(output_file, 'w') as outfile:
-      outfile.write(formatted_results)
-
-  data = read_json(file_obj)
-  environment_context = (f"Era: {data['era']}, "
-                         f"Time Period: {data['time_period']}, "
-                         f"Detail: {data['detail']}\n\n")
+  results = []
 
+  # Append each character to output.jsonl in the main project folder as soon
+  # as it completes, one JSON document per line
+  output_file = os.path.join(os.getcwd(), 'output.jsonl')
+  with open(output_file, 'a', buffering=1, encoding='utf-8') as outfile:
+    try:
+      for task in asyncio.as_completed(tasks):
+        character = jsonio.loads(await task)
+        results.append(character)
+        outfile.write(jsonio.dumps(character) + "\n")
+    except BaseException:
+      # One failed character aborts the batch; don't leave the rest running
+      for task in tasks:
+        task.cancel()
+      raise
 
-  prompt = environment_context 
+  prompt = environment_context
 
   edgelist_examples = example.edge_list
 
   edge_list = await relationship_generation(prompt, edgelist_examples, results)
 
-  formatted_results = json.dumps(edge_list, indent=2)
+  formatted_results = jsonio.dumps(edge_list, indent=True)
   # Write the formatted results to output.json in the main project folder
   output_file = os.path.join(os.getcwd(), 'output-edgelist.json')
-  with open(output_file, 'w') as outfile:
+  with open(output_file, 'w', encoding='utf-8') as outfile:
       outfile.write(formatted_results)
 
   #combine results and edgelist together
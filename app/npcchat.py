@@ -29,7 +29,7 @@ client = chromadb.PersistentClient(path=persist_directory)
 
 
 def npc_chat(message, history):
-    initial_time = time.time()
+    initial_time = time.perf_counter()
     load_dotenv()
 
     # Initialize chromaDB
@@ -97,11 +97,15 @@ def npc_chat(message, history):
     )
 
 
-    t = f"Time taken: {time.time() - initial_time}"
+    t = f"Time taken: {time.perf_counter() - initial_time}"
     print(t)
 
     return t + "\n\n" + output.content
 
 
 def shutdown():
-    client.close()
\ No newline at end of file
+    # chromadb's PersistentClient has no close() (0.5.x); writes are already
+    # persisted, so only close clients that actually support it
+    close = getattr(client, "close", None)
+    if close is not None:
+        close()
\ No newline at end of file
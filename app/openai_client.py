@@ -0,0 +1,20 @@
+import os
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+
+load_dotenv()
+
+# One connection pool per process so concurrent calls reuse TCP/TLS sessions
+_limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+client = OpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=httpx.Client(limits=_limits, timeout=60),
+)
+
+async_client = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=httpx.AsyncClient(limits=_limits, timeout=60),
+)
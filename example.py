@@ -1,59 +1,72 @@
-examples = [
-  {
-    "example":""" name: ,
-    age: 0,
-    gender: ,
-    personalities: [],
-    appearance: {
-      description: ,
-      height: ,
-      weight: ,
-      hair: ,
-      eyes: 
+character_schema = {
+  "type": "object",
+  "properties": {
+    "name": {"type": "string"},
+    "age": {"type": "integer"},
+    "gender": {"type": "string"},
+    "personalities": {"type": "array", "items": {"type": "string"}},
+    "appearance": {
+      "type": "object",
+      "properties": {
+        "description": {"type": "string"},
+        "height": {"type": "string"},
+        "weight": {"type": "string"},
+        "hair": {"type": "string"},
+        "eyes": {"type": "string"}
+      },
+      "required": ["description", "height", "weight", "hair", "eyes"],
+      "additionalProperties": False
     },
-    background: {
-      hometown: ,
-      family: ,
-      motivation: 
+    "background": {
+      "type": "object",
+      "properties": {
+        "hometown": {"type": "string"},
+        "family": {"type": "string"},
+        "motivation": {"type": "string"}
+      },
+      "required": ["hometown", "family", "motivation"],
+      "additionalProperties": False
     },
-    skills: [],
-    secrets: [] """
+    "skills": {"type": "array", "items": {"type": "string"}},
+    "secrets": {"type": "array", "items": {"type": "string"}}
   },
+  "required": [
+    "name", "age", "gender", "personalities", "appearance", "background",
+    "skills", "secrets"
+  ],
+  "additionalProperties": False
+}
+
+# Few-shot characters; the field layout comes from character_schema, so only
+# the values are sent with the prompt
+examples = [
   {
-    "example":"""name: Mary,
-    age: 25,
-    gender: female,
+    "name": "Mary",
+    "age": 25,
+    "gender": "female",
     "personalities": ["friendly", "caring", "lazy", "toxic", "daring"],
-    appearance: {
-      description: a bubbly and vivacious young woman with a mischievous grin and a wild mane of curly hair. She has a curvaceous figure and often wears bright and colorful clothing that accentuates her assets.,
-      height: 5'5,
-      weight: 120 lbs,
-      hair: curly,
-      eyes: piercing blue
+    "appearance": {
+      "description": "a bubbly and vivacious young woman with a mischievous grin and a wild mane of curly hair. She has a curvaceous figure and often wears bright and colorful clothing that accentuates her assets.",
+      "height": "5'5",
+      "weight": "120 lbs",
+      "hair": "curly",
+      "eyes": "piercing blue"
     },
-    background: {
-      hometown: a small, secluded town on the outskirts of a dense forest,
-      family: her parents were both skilled warriors who taught her everything they knew about combat and survival,
-      motivation: to avenge her family's death and see the world beyond her own borders
+    "background": {
+      "hometown": "a small, secluded town on the outskirts of a dense forest",
+      "family": "her parents were both skilled warriors who taught her everything they knew about combat and survival",
+      "motivation": "to avenge her family's death and see the world beyond her own borders"
     },
-    skills: [
-      swordfighter,
-      manipulation
-    ],
-    secrets: [
-      she is toxic and can use her charm and wit to manipulate others to do her bidding
-    ]"""
+    "skills": ["swordfighter", "manipulation"],
+    "secrets": [
+      "she is toxic and can use her charm and wit to manipulate others to do her bidding"
+    ]
   },
   {
-    "example": """name: Lyrion,
-    age: 28,
-    gender: Male,
-    personalities: [
-      "Introspective",
-      "Compassionate",
-      "Curious",
-      "Diplomatic"
-    ],
+    "name": "Lyrion",
+    "age": 28,
+    "gender": "Male",
+    "personalities": ["Introspective", "Compassionate", "Curious", "Diplomatic"],
     "appearance": {
       "description": "Lyrion has a slender, elegant physique typical of a Zythorian, with shimmering, iridescent scales that change colors reflecting his mood. His scales predominantly exhibit shades of serene blues and vibrant greens.",
       "height": "7'2\"",
@@ -75,27 +88,34 @@ examples = [
     "secrets": [
       "Unbeknownst to most, Lyrion possesses an ancient Zytherian artifact that enhances telepathic abilities",
       "Harbors a deep-seated curiosity about Earth's oceans, stemming from Zytherian legends of ancient sea-like environments on their own planet"
-    ]"""
+    ]
   },
   {
-    "example": """name: Elena Rivera,
-    age: 28,
-    gender: Female,
-    personalities: [Intelligent, Resourceful, Compassionate, Determined],
-    appearance: {
-      description: Elena has an athletic build, with a confident posture.,
-      height: 5'7",
-      weight: 140 lbs,
-      hair: Long, wavy dark brown hair,
-      eyes: Hazel
+    "name": "Elena Rivera",
+    "age": 28,
+    "gender": "Female",
+    "personalities": ["Intelligent", "Resourceful", "Compassionate", "Determined"],
+    "appearance": {
+      "description": "Elena has an athletic build, with a confident posture.",
+      "height": "5'7\"",
+      "weight": "140 lbs",
+      "hair": "Long, wavy dark brown hair",
+      "eyes": "Hazel"
     },
-    background: {
-      hometown: Santa Fe, New Mexico,
-      family: Only child, raised by a single mother who is a renowned botanist,
-      motivation: Elena is driven by a desire to make a significant contribution to environmental conservation, inspired by her mother's dedication to botany.
+    "background": {
+      "hometown": "Santa Fe, New Mexico",
+      "family": "Only child, raised by a single mother who is a renowned botanist",
+      "motivation": "Elena is driven by a desire to make a significant contribution to environmental conservation, inspired by her mother's dedication to botany."
     },
-    skills: [Expert in environmental science, Skilled in wilderness survival, Fluent in Spanish and English, Trained in basic first aid],
-    secrets: [Elena discovered an unknown plant species but hasn't disclosed it yet due to potential threats from pharmaceutical companies]"""
+    "skills": [
+      "Expert in environmental science",
+      "Skilled in wilderness survival",
+      "Fluent in Spanish and English",
+      "Trained in basic first aid"
+    ],
+    "secrets": [
+      "Elena discovered an unknown plant species but hasn't disclosed it yet due to potential threats from pharmaceutical companies"
+    ]
   }
 ]
 
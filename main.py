@@ -1,3 +1,10 @@
+import os
+import signal
+import sys
+
+# Must be set before gradio is first imported (app.generation imports it)
+os.environ.setdefault("GRADIO_ANALYTICS_ENABLED", "False")
+
 from app.generation import instruction
 from app.npcchat import npc_chat, shutdown
 import gradio as gr
@@ -18,7 +25,24 @@ demo = gr.Interface(fn=instruction,
                     title="JSON File Reader",
                     description="Upload a JSON file and see its contents.")
 
-demo.launch(share=True)
+# The handler is async and IO-bound, so let many requests share the event loop
+demo.queue(default_concurrency_limit=20, max_size=64)
+
+
+def handle_shutdown(_signum, _frame):
+  try:
+    shutdown()
+  finally:
+    demo.close()
+    sys.exit(0)
+
+
+# Close the chat store and the server on Ctrl+C / SIGTERM rather than at
+# interpreter teardown, so the port is released cleanly
+signal.signal(signal.SIGINT, handle_shutdown)
+signal.signal(signal.SIGTERM, handle_shutdown)
+
+demo.launch(share=True, max_threads=64, show_api=False, quiet=True)
 
 
 
@@ -27,7 +51,4 @@ demo.launch(share=True)
 # demo = gr.ChatInterface(fn=npc_chat)
 
 if __name__ == "__main__":
-  demo.launch()
-
-  # Capture shutdown signals
-  demo.close(shutdown)
\ No newline at end of file
+  demo.launch(max_threads=64, show_api=False, quiet=True)
\ No newline at end of file
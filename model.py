@@ -1,15 +1,23 @@
-from langchain.pydantic_v1 import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List
 
 
-class Envrionment(BaseModel):
+class Environment(BaseModel):
+  model_config = ConfigDict(extra="ignore")
+
   era: str = Field(description="distinct period in history with unique events")
   time_period: str = Field(description="starting and ending year of era")
   detail: str = Field(
       description="specific detail about how people lived in the era")
 
 
+# Kept for code that still imports the original misspelling
+Envrionment = Environment
+
+
 class NPC(BaseModel):
+  model_config = ConfigDict(extra="ignore")
+
   name: str = Field(description="name of the NPC")
   age: int = Field(description="age of the NPC")
   gender: str = Field(description="gender of the NPC")
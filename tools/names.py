@@ -1,36 +1,46 @@
-import json
-import os
 import gradio as gr
-from openai import OpenAI
-from utils.read import read_json
-from dotenv import load_dotenv
+from app.openai_client import async_client
+from utils.read import read_environment_context
+from utils import jsonio
 
 
 
 
 
 
-def generate_names(file_obj, amount):
-  load_dotenv()
-  client = OpenAI(
-    # This is the default and can be omitted
-    api_key=os.getenv("OPENAI_API_KEY"),
-  )
-  data = read_json(file_obj)
-  environment_context = (
-      f"Era: {data['era']}, "
-      f"Time Period: {data['time_period']}, "
-      f"Detail: {data['detail']}\n\n"
-  )
+async def generate_names(file_obj, amount):
+  environment_context = read_environment_context(file_obj)
   
-  prompt = environment_context + "Given the json file describing an environment, create " + str(amount) + " unique names for NPCs in that environment. Output a list of these names in a json format." 
+  prompt = environment_context + "Given the json file describing an environment, create " + str(amount) + " unique names for NPCs in that environment." 
+
+  # Emitting the names as a tool call makes the model fill in this schema
+  # instead of free-form JSON
+  emit_names = {
+    "type": "function",
+    "function": {
+      "name": "emit_names",
+      "parameters": {
+        "type": "object",
+        "properties": {
+          "names": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": amount,
+            "maxItems": amount
+          }
+        },
+        "required": ["names"]
+      }
+    }
+  }
 
-  chat_completion = client.chat.completions.create(
-    response_format={ "type": "json_object" },
+  chat_completion = await async_client.chat.completions.create(
+    tools=[emit_names],
+    tool_choice={"type": "function", "function": {"name": "emit_names"}},
     messages=[
         {
             "role": "system",
-            "content": "You are a creative team designing NPC characters. Given these personalities, choose 5, and output in a json",
+            "content": "You are a creative team designing NPC characters. Given an environment, create names for its NPCs",
         },
       {
           "role": "user",
@@ -41,5 +51,15 @@ def generate_names(file_obj, amount):
     model="gpt-3.5-turbo-0125",
   )
 
-  print(chat_completion.choices[0].message.content)
-  return chat_completion.choices[0].message.content
+  choice = chat_completion.choices[0]
+  # A refusal or a response cut off at the token limit carries no tool call
+  if not choice.message.tool_calls:
+    raise ValueError(
+        f"Name generation returned no names (finish_reason={choice.finish_reason})")
+  arguments = choice.message.tool_calls[0].function.arguments
+  print(arguments)
+  # All names come back from this one call; callers index into the list, so
+  # drop repeats and pad any shortfall to exactly amount entries
+  names = list(dict.fromkeys(jsonio.loads(arguments)["names"]))
+  names.extend(f"Character_{i}" for i in range(len(names), amount))
+  return names[:amount]
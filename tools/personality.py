@@ -1,30 +1,33 @@
+import functools
 import os
 import random
-import json
+
+from utils import jsonio
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+@functools.lru_cache(maxsize=1)
+def read_personality_data():
+  """Load the trait list and polar opposites once per process."""
+  with open(os.path.join(ROOT_DIR, "personality.txt"), "r") as f:
+    # personality.txt repeats some words; sampling must not pick one twice
+    p = tuple(dict.fromkeys(f.read().split()))
+
+  with open(os.path.join(ROOT_DIR, "JSONData/polar_opposites.json"),
+            "rb") as json_file:
+    polar_opposites = jsonio.loads(json_file.read())["Compatible Traits"]
+
+  return p, polar_opposites
 
 
 def read_personality():
-  p = ""
-  with open("personality.txt", "r") as f:
-    p = f.read()
-
-  with open(
-      os.path.join(os.path.dirname(__file__), "../data/polar_opposites.json"),
-      "r") as json_file:
-    polar_opposites = json.load(json_file)
-  p = p.replace("\n", " ").split()
-
-  personality_list = random.sample(p, 5)
-  isReady = False
-  while not isReady:
-
-    for i, personality in enumerate(personality_list):
-      if polar_opposites.get(personality) in personality_list:
-        personality_list[i] = random.choice(p)
-
-    if not any(
-        polar_opposites.get(x) in personality_list for x in personality_list):
-      isReady = True
-      break
-
-  return personality_list
+  p, polar_opposites = read_personality_data()
+
+  # Redraw the whole sample until no trait's opposite is also in it; with
+  # 5 of several hundred traits the first draw almost always passes
+  while True:
+    personality_list = random.sample(p, 5)
+    chosen = set(personality_list)
+    if not any(polar_opposites.get(x) in chosen for x in personality_list):
+      return personality_list
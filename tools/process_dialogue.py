@@ -1,7 +1,5 @@
 import json
-import os
-from openai import OpenAI
-from dotenv import load_dotenv
+from app.openai_client import client
 
 
 
@@ -13,15 +11,7 @@ Of course, there are countless other wonders to discover on Nova Terra, and I'm
 
 
 def process_dialogue(dialogue):
-  load_dotenv()
-  client = OpenAI(
-    # This is the default and can be omitted
-    api_key=os.getenv("OPENAI_API_KEY"),
-  )
-  
-  
-  
-  prompt = "Set this paragraph into important bullet points" + example
+  prompt = "Set this paragraph into important bullet points: " + dialogue
 
   chat_completion = client.chat.completions.create(
     response_format={ "type": "json_object" },
@@ -42,4 +32,6 @@ def process_dialogue(dialogue):
   print(chat_completion.choices[0].message.content)
   return chat_completion.choices[0].message.content
 
-process_dialogue(example)
\ No newline at end of file
+
+if __name__ == "__main__":
+  process_dialogue(example)
@@ -0,0 +1,20 @@
+import json
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
+
+def loads(data):
+  if orjson is not None:
+    return orjson.loads(data)
+  return json.loads(data)
+
+
+def dumps(obj, indent=False):
+  """Serialize obj to a JSON string, using orjson when it is installed."""
+  if orjson is not None:
+    option = orjson.OPT_INDENT_2 if indent else 0
+    return orjson.dumps(obj, option=option).decode()
+  return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
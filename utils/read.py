@@ -1,10 +1,31 @@
-import json
-
-def read_json(file_obj):
-  try:
-    # Load JSON file
-    with open(file_obj.name, "r") as file:
-      data = json.load(file)
-    return data
-  except Exception as e:
-    return {"error": str(e)}
\ No newline at end of file
+import functools
+import os
+
+from utils import jsonio
+
+
+@functools.lru_cache(maxsize=32)
+def read_json_cached(path, _mtime_ns, _size):
+  """Parse the file at path; the stat values only key the cache."""
+  # The returned dict is shared between callers and must not be mutated
+  with open(path, "rb", buffering=64 * 1024) as file:
+    return jsonio.loads(file.read())
+
+
+@functools.lru_cache(maxsize=32)
+def environment_context_cached(path, mtime_ns, size):
+  """Build the prompt prefix from the cached parse of the file at path."""
+  data = read_json_cached(path, mtime_ns, size)
+  detail = data["detail"]
+  # Structured details go to the model as JSON rather than a Python repr
+  if isinstance(detail, dict):
+    detail = jsonio.dumps(detail)
+  return (f"Era: {data['era']}, "
+          f"Time Period: {data['time_period']}, "
+          f"Detail: {detail}\n\n")
+
+
+def read_environment_context(file_obj):
+  """Format the era/time period/detail prompt prefix for an environment file."""
+  st = os.stat(file_obj.name)
+  return environment_context_cached(file_obj.name, st.st_mtime_ns, st.st_size)